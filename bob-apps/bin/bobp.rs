@@ -4,9 +4,11 @@ use bob::{
 };
 
 use clap::{App, Arg, ArgMatches};
+use std::collections::hash_map::RandomState;
 use std::collections::HashMap;
 use std::error::Error;
 use std::fmt::{Debug, Formatter, Result as FmtResult};
+use std::hash::{BuildHasher, Hasher};
 use std::ops::Sub;
 use std::str::FromStr;
 use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
@@ -22,6 +24,9 @@ use tonic::{Code, Request, Status};
 #[macro_use]
 extern crate log;
 
+const CONNECT_RETRY_INITIAL_DELAY: Duration = Duration::from_millis(250);
+const CONNECT_RETRY_MAX_DELAY: Duration = Duration::from_secs(1);
+
 #[derive(Clone)]
 struct NetConfig {
     port: u16,
@@ -47,11 +52,13 @@ impl NetConfig {
 
     async fn build_client(&self) -> BobApiClient<Channel> {
         let endpoint = Endpoint::from(self.get_uri()).tcp_nodelay(true);
+        let mut delay = CONNECT_RETRY_INITIAL_DELAY;
         loop {
             match BobApiClient::connect(endpoint.clone()).await {
                 Ok(client) => return client,
                 Err(e) => {
-                    sleep(Duration::from_millis(1000)).await;
+                    sleep(delay + retry_jitter(delay)).await;
+                    delay = (delay * 2).min(CONNECT_RETRY_MAX_DELAY);
                     println!(
                         "{:?}",
                         e.source()
@@ -64,6 +71,13 @@ impl NetConfig {
     }
 }
 
+// All workers start connecting at once, so spread their retries to avoid hitting bob in lockstep
+fn retry_jitter(delay: Duration) -> Duration {
+    let random = RandomState::new().build_hasher().finish();
+    let max_jitter_ns = delay.as_nanos() as u64 / 2 + 1;
+    Duration::from_nanos(random % max_jitter_ns)
+}
+
 impl Debug for NetConfig {
     fn fmt(&self, f: &mut Formatter<'_>) -> FmtResult {
         write!(f, "{}:{}", self.target, self.port)
@@ -76,6 +90,7 @@ struct TaskConfig {
     count: u64,
     payload_size: u64,
     direct: bool,
+    verify: bool,
     measure_time: bool,
 }
 
@@ -86,6 +101,7 @@ impl TaskConfig {
             count: matches.value_or_default("count"),
             payload_size: matches.value_or_default("payload"),
             direct: matches.is_present("direct"),
+            verify: matches.is_present("verify"),
             measure_time: false,
         }
     }
@@ -126,10 +142,12 @@ impl Debug for TaskConfig {
             self.payload_size, self.count
         )?;
         if self.direct {
-            write!(f, ", direct")
-        } else {
-            Ok(())
+            write!(f, ", direct")?;
+        }
+        if self.verify {
+            write!(f, ", verify")?;
         }
+        Ok(())
     }
 }
 
@@ -292,7 +310,7 @@ async fn main() {
 
     let stop_token: Arc<AtomicBool> = Arc::new(AtomicBool::new(false));
 
-    let stat_thread = spawn_statistics_thread(&benchmark_conf, &stop_token);
+    let stat_thread = spawn_statistics_thread(&benchmark_conf, task_conf.verify, &stop_token);
 
     let workers = spawn_workers(&net_conf, &task_conf, &benchmark_conf);
 
@@ -314,10 +332,11 @@ async fn stat_worker(
     period_ms: u64,
     stat: Arc<Statistics>,
     request_bytes: u64,
+    verify: bool,
 ) {
     let (put_speed_values, get_speed_values, elapsed) =
         print_periodic_stat(stop_token, period_ms, &stat, request_bytes);
-    print_averages(&stat, &put_speed_values, &get_speed_values, elapsed);
+    print_averages(&stat, &put_speed_values, &get_speed_values, elapsed, verify);
     print_errors_with_codes(stat).await
 }
 
@@ -343,6 +362,7 @@ fn print_averages(
     put_speed_values: &[f64],
     get_speed_values: &[f64],
     elapsed: Duration,
+    verify: bool,
 ) {
     println!(
         "avg total: {} rps | total err: {}\r\n\
@@ -365,7 +385,7 @@ fn print_averages(
                 / 1e9
         ),
     );
-    if get_matches().is_present("verify") {
+    if verify {
         println!(
             "verified put threads: {}",
             stat.verified_puts.load(Ordering::Relaxed)
@@ -502,13 +522,13 @@ async fn put_worker(net_conf: NetConfig, task_conf: TaskConfig, stat: Arc<Statis
         }
         stat.put_total.fetch_add(1, Ordering::SeqCst);
     }
-    let req = Request::new(ExistRequest {
-        keys: (task_conf.low_idx..upper_idx)
-            .map(|i| BlobKey { key: i })
-            .collect(),
-        options: task_conf.find_get_options(),
-    });
-    if get_matches().is_present("verify") {
+    if task_conf.verify {
+        let req = Request::new(ExistRequest {
+            keys: (task_conf.low_idx..upper_idx)
+                .map(|i| BlobKey { key: i })
+                .collect(),
+            options: task_conf.find_get_options(),
+        });
         let res = client.exist(req).await;
         if let Ok(res) = res {
             if res.into_inner().exist.iter().all(|b| *b) {
@@ -590,6 +610,7 @@ fn spawn_workers(
                 count,
                 payload_size: task_conf.payload_size,
                 direct: task_conf.direct,
+                verify: task_conf.verify,
                 measure_time: i == 0,
             };
             match benchmark_conf.behavior {
@@ -604,12 +625,13 @@ fn spawn_workers(
 
 fn spawn_statistics_thread(
     benchmark_conf: &BenchmarkConfig,
+    verify: bool,
     stop_token: &Arc<AtomicBool>,
 ) -> JoinHandle<()> {
     let stop_token = stop_token.clone();
     let stat = benchmark_conf.statistics.clone();
     let bytes_amount = benchmark_conf.request_amount_bytes;
-    tokio::spawn(stat_worker(stop_token, 1000, stat, bytes_amount))
+    tokio::spawn(stat_worker(stop_token, 1000, stat, bytes_amount, verify))
 }
 
 fn create_blob(task_conf: &TaskConfig) -> Blob {
@@ -4,23 +4,27 @@ mod config_cluster_generator;
 extern crate log;
 
 use bob::{ClusterConfig, ClusterNodeConfig as ClusterNode};
-use clap::{App, Arg, ArgMatches, SubCommand};
+use clap::{App, AppSettings, Arg, ArgMatches, SubCommand};
 use config_cluster_generator::{
     center::{get_new_disks, get_pairs_count, get_structure},
     utils::{init_logger, lcm, read_config_from_file, write_to_file},
 };
+use std::process::exit;
 
 #[tokio::main]
 async fn main() {
     init_logger();
-    match get_matches().subcommand() {
+    let result = match get_matches().subcommand() {
         ("new", Some(matches)) => subcommand_new(matches),
         ("expand", Some(matches)) => subcommand_expand(matches),
         _ => {
             debug!("incorrect arguments: ERR");
-            Some(())
+            None
         }
     };
+    if result.is_none() {
+        exit(1);
+    }
 }
 
 fn subcommand_new(matches: &ArgMatches) -> Option<()> {
@@ -37,10 +41,11 @@ fn subcommand_new(matches: &ArgMatches) -> Option<()> {
             println!("{}", output);
             debug!("no file provided, stdout print: OK");
         }
+        Some(())
     } else {
         debug!("config cluster generation: ERR");
+        None
     }
-    Some(())
 }
 
 fn subcommand_expand(matches: &ArgMatches) -> Option<()> {
@@ -202,6 +207,7 @@ fn get_matches() -> ArgMatches<'static> {
         .arg(replicas);
 
     App::new("Config Cluster Generator")
+        .setting(AppSettings::SubcommandRequiredElseHelp)
         .subcommand(subcommand_expand)
         .subcommand(subcommand_new)
         .get_matches()
@@ -2,8 +2,10 @@ use bob::ClusterConfig;
 use chrono::Local;
 use env_logger::fmt::Color;
 use log::{Level, LevelFilter};
-use std::fs::{File, OpenOptions};
-use std::io::{Read, Write};
+use std::fs::{canonicalize, metadata, remove_file, rename, File, OpenOptions};
+use std::io::{self, Read, Write};
+use std::path::{Path, PathBuf};
+use std::process;
 
 pub fn init_logger() {
     env_logger::builder()
@@ -64,17 +66,57 @@ pub fn read_file(mut file: File) -> Option<String> {
 }
 
 pub fn write_to_file(mut output: String, name: String) {
-    let mut file = OpenOptions::new()
-        .write(true)
-        .create(true)
-        .truncate(true)
-        .open(name)
-        .expect("File IO error");
     output += "\n";
-    file.write_all(output.as_bytes()).expect("File IO error");
+    // resolve symlinks, so the link is kept and the temp file is created next to the target
+    let path = canonicalize(&name).unwrap_or_else(|_| PathBuf::from(&name));
+    if path.exists() && !path.is_file() {
+        // not a regular file (e.g. /dev/stdout), nothing to replace
+        let mut file = OpenOptions::new()
+            .write(true)
+            .open(&path)
+            .expect("File IO error");
+        file.write_all(output.as_bytes()).expect("File IO error");
+    } else {
+        write_atomically(&path, output.as_bytes()).expect("File IO error");
+    }
     debug!("write to file: OK");
 }
 
+// output is often the input config itself, so never leave it partially written
+fn write_atomically(path: &Path, data: &[u8]) -> io::Result<()> {
+    let mut tmp_name = path.as_os_str().to_owned();
+    tmp_name.push(format!(".{}.tmp", process::id()));
+    let tmp_path = PathBuf::from(tmp_name);
+    let file = OpenOptions::new()
+        .write(true)
+        .create_new(true)
+        .open(&tmp_path)?;
+    let res = write_synced(file, path, data)
+        .and_then(|_| rename(&tmp_path, path))
+        .and_then(|_| sync_parent_dir(path));
+    if res.is_err() {
+        let _ = remove_file(&tmp_path);
+    }
+    res
+}
+
+fn write_synced(mut file: File, target: &Path, data: &[u8]) -> io::Result<()> {
+    // keep the mode of the replaced file, owner and hard links are not preserved
+    if let Ok(target_metadata) = metadata(target) {
+        file.set_permissions(target_metadata.permissions())?;
+    }
+    file.write_all(data)?;
+    file.sync_all()
+}
+
+fn sync_parent_dir(path: &Path) -> io::Result<()> {
+    let dir = match path.parent() {
+        Some(dir) if !dir.as_os_str().is_empty() => dir,
+        _ => Path::new("."),
+    };
+    File::open(dir)?.sync_all()
+}
+
 fn deserialize(content: String) -> Option<ClusterConfig> {
     serde_yaml::from_str(content.as_str())
         .map(|c: ClusterConfig| {
@@ -103,3 +145,107 @@ pub fn lcm(a: usize, b: usize) -> usize {
     debug!("lcm of {} and {} is {}", a, b, lcm);
     lcm
 }
+
+#[cfg(test)]
+mod tests {
+    use super::write_to_file;
+    use std::fs::{
+        create_dir_all, read_dir, read_link, read_to_string, remove_dir_all, set_permissions,
+        symlink_metadata, Permissions,
+    };
+    use std::os::unix::fs::{symlink, PermissionsExt};
+    use std::path::{Path, PathBuf};
+    use std::process;
+
+    fn test_dir(name: &str) -> PathBuf {
+        let dir = std::env::temp_dir().join(format!("ccg_utils_{}_{}", process::id(), name));
+        let _ = remove_dir_all(&dir);
+        create_dir_all(&dir).expect("create test dir");
+        dir
+    }
+
+    fn write(path: &Path, content: &str) {
+        write_to_file(content.to_string(), path.to_str().unwrap().to_string());
+    }
+
+    fn files_count(dir: &Path) -> usize {
+        read_dir(dir).expect("read test dir").count()
+    }
+
+    #[test]
+    fn writes_new_file() {
+        let dir = test_dir("new");
+        let output = dir.join("cluster.yaml");
+        write(&output, "new");
+        assert_eq!(read_to_string(&output).unwrap(), "new\n", "wrong content");
+        assert_eq!(files_count(&dir), 1, "temp file left");
+        remove_dir_all(dir).unwrap();
+    }
+
+    #[test]
+    fn replaces_file_keeping_permissions() {
+        let dir = test_dir("replace");
+        let output = dir.join("cluster.yaml");
+        write(&output, "old");
+        set_permissions(&output, Permissions::from_mode(0o640)).unwrap();
+        write(&output, "new");
+        assert_eq!(read_to_string(&output).unwrap(), "new\n", "wrong content");
+        let mode = symlink_metadata(&output).unwrap().permissions().mode();
+        assert_eq!(mode & 0o777, 0o640, "permissions not kept");
+        remove_dir_all(dir).unwrap();
+    }
+
+    #[test]
+    fn keeps_existing_tmp_file() {
+        let dir = test_dir("tmp");
+        let output = dir.join("cluster.yaml");
+        let tmp = dir.join("cluster.yaml.tmp");
+        write(&tmp, "foreign");
+        write(&output, "new");
+        assert_eq!(
+            read_to_string(&tmp).unwrap(),
+            "foreign\n",
+            "tmp file changed"
+        );
+        assert_eq!(files_count(&dir), 2, "temp file left");
+        remove_dir_all(dir).unwrap();
+    }
+
+    #[test]
+    fn replaces_symlink_target_keeping_link() {
+        let dir = test_dir("symlink");
+        let target = dir.join("real.yaml");
+        let output = dir.join("cluster.yaml");
+        write(&target, "old");
+        symlink(&target, &output).unwrap();
+        write(&output, "new");
+        assert_eq!(read_link(&output).unwrap(), target, "link replaced");
+        assert_eq!(read_to_string(&target).unwrap(), "new\n", "wrong content");
+        assert_eq!(files_count(&dir), 2, "temp file left");
+        remove_dir_all(dir).unwrap();
+    }
+
+    #[test]
+    fn replaces_dangling_symlink_with_file() {
+        let dir = test_dir("dangling");
+        let output = dir.join("cluster.yaml");
+        symlink(dir.join("missing.yaml"), &output).unwrap();
+        write(&output, "new");
+        let output_metadata = symlink_metadata(&output).unwrap();
+        assert!(output_metadata.is_file(), "dangling link not replaced");
+        assert_eq!(read_to_string(&output).unwrap(), "new\n", "wrong content");
+        remove_dir_all(dir).unwrap();
+    }
+
+    #[test]
+    fn writes_non_regular_file_in_place() {
+        let dir = test_dir("device");
+        let output = dir.join("null");
+        symlink("/dev/null", &output).unwrap();
+        write(&output, "new");
+        let output_metadata = symlink_metadata(&output).unwrap();
+        assert!(output_metadata.file_type().is_symlink(), "link replaced");
+        assert_eq!(files_count(&dir), 1, "temp file left");
+        remove_dir_all(dir).unwrap();
+    }
+}
@@ -121,7 +121,7 @@ impl Serialize for DockerEnv {
     }
 }
 
-#[derive(new)]
+#[derive(new, Clone)]
 pub struct SecurityOpt {
     seccomp: String,
 }
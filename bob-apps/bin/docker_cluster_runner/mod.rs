@@ -73,18 +73,23 @@ impl TestClusterConfiguration {
         fs_configuration: FSConfiguration,
         network_name: String,
     ) -> Result<DockerCompose> {
+        let config_dir =
+            Self::convert_to_absolute_path(&fs_configuration.cluster_configuration_dir)?;
+        let build = Self::get_build_command(&fs_configuration)?;
+        let volumes = Self::get_volumes(&fs_configuration, &config_dir)?;
+        let security_opts = Self::get_security_opts(&config_dir)?;
         let mut services = HashMap::with_capacity(self.nodes_count as usize);
         for node in 0..self.nodes_count {
             services.insert(
                 Self::get_node_name(node),
                 DockerService::new(
-                    Self::get_build_command(&fs_configuration)?,
-                    Self::get_volumes(&fs_configuration)?,
+                    build.clone(),
+                    volumes.clone(),
                     Self::get_docker_command(node),
                     Self::get_networks_with_single_network(node, &network_name),
                     Self::get_ports(node),
                     Self::get_docker_env(node),
-                    Self::get_security_opts(&fs_configuration)?,
+                    security_opts.clone(),
                     Self::get_ulimits(),
                 ),
             );
@@ -115,11 +120,8 @@ impl TestClusterConfiguration {
         ULimits::new(4194304000, FileLimits::new(98304, 98304))
     }
 
-    fn get_security_opts(fs_configuration: &FSConfiguration) -> Result<Vec<SecurityOpt>> {
-        let filename = format!(
-            "{}/profile.json",
-            Self::convert_to_absolute_path(&fs_configuration.cluster_configuration_dir)?
-        );
+    fn get_security_opts(config_dir: &str) -> Result<Vec<SecurityOpt>> {
+        let filename = format!("{}/profile.json", config_dir);
         if !Path::new(&filename).exists() {
             let content = "{ \"syscalls\": [] }";
             fs::write(&filename, content)?;
@@ -127,14 +129,18 @@ impl TestClusterConfiguration {
         Ok(vec![SecurityOpt::new(filename)])
     }
 
-    fn get_volumes(fs_configuration: &FSConfiguration) -> Result<Vec<VolumeMapping>> {
-        let config_dir =
-            Self::convert_to_absolute_path(&fs_configuration.cluster_configuration_dir)?;
+    fn get_volumes(
+        fs_configuration: &FSConfiguration,
+        config_dir: &str,
+    ) -> Result<Vec<VolumeMapping>> {
         let disks_dir = Self::convert_to_absolute_path(&fs_configuration.disks_dir)?;
         let ssh_dir = Self::convert_to_absolute_path(&fs_configuration.ssh_dir())?;
         let volumes = vec![
             VolumeMapping::new(disks_dir, DockerFSConstants::docker_disks_dir()),
-            VolumeMapping::new(config_dir, DockerFSConstants::docker_configs_dir()),
+            VolumeMapping::new(
+                config_dir.to_string(),
+                DockerFSConstants::docker_configs_dir(),
+            ),
             VolumeMapping::new(ssh_dir, DockerFSConstants::docker_ssh_dir()),
         ];
         Ok(volumes)
@@ -1,4 +1,4 @@
 #!/bin/bash
 tmux \
     new-session  "cargo run $1 --bin bobd  -- -c cluster.yaml -n  node.yaml; read -p 'Press enter to continue'" \; \
-    split-window "sleep 5; cargo run $1 --bin bobp; read -p 'Press enter to continue'"
+    split-window "bash -c 'for _ in {1..600}; do (: > /dev/tcp/127.0.0.1/20000) 2>/dev/null && exec cargo run $1 --bin bobp; sleep 1; done; echo \"bobd is not listening on 127.0.0.1:20000 after 600s\"'; read -p 'Press enter to continue'"